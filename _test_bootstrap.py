@@ -0,0 +1,200 @@
+"""Shared setup for the Warbler test modules.
+
+Test modules import app, db and the models from here rather than from app,
+so the environment is set up before the app is first imported, and only
+once per process.
+"""
+
+
+import os
+from unittest import TestCase
+
+from sqlalchemy import event
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.pool import StaticPool
+
+# BEFORE we import our app, let's set an environmental variable
+# to use a different database for tests (we need to do this
+# before we import our app, since that will have already
+# connected to the database. Set TEST_DATABASE_URL to run the
+# tests against something else, e.g. postgresql:///warbler-test
+
+database_url = os.environ.get('TEST_DATABASE_URL', "sqlite:///:memory:")
+
+# Each pytest-xdist worker is its own process, so it already gets its own
+# in-memory SQLite db. On a database server, each worker gets its own db
+# instead (warbler-test-gw0, warbler-test-gw1, ...), which must exist.
+
+worker = os.environ.get('PYTEST_XDIST_WORKER')
+if worker and not database_url.startswith('sqlite'):
+    url = make_url(database_url)
+    url.database = f"{url.database}-{worker}"
+    database_url = str(url)
+
+os.environ['DATABASE_URL'] = database_url
+
+# Hashing passwords at full strength only slows the tests down; 4 is the
+# fewest rounds bcrypt allows
+
+os.environ['BCRYPT_LOG_ROUNDS'] = "4"
+
+from app import app, CURR_USER_KEY
+from models import db, User, Message, Follows
+
+# Don't have WTForms use CSRF at all, since it's a pain to test. And with
+# TESTING on, Flask-SQLAlchemy would record every query along with the
+# stack frame it came from, which no test looks at.
+
+app.config['TESTING'] = True
+app.config['WTF_CSRF_ENABLED'] = False
+app.config['SQLALCHEMY_RECORD_QUERIES'] = False
+
+# An in-memory SQLite db only lives as long as its connection, so every
+# session and thread has to share that one connection.
+#
+# Test data is thrown away, so don't make Postgres wait for each commit to
+# reach the disk. For a dedicated test server, the same goes cluster-wide in
+# postgresql.conf: fsync = off, synchronous_commit = off,
+# full_page_writes = off, checkpoint_timeout = 1h
+#
+# The whole run also shares a single connection (see setup_test_database),
+# so there's no point in keeping a pool of them.
+
+if app.config['SQLALCHEMY_DATABASE_URI'] == "sqlite:///:memory:":
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'connect_args': {'check_same_thread': False},
+        'poolclass': StaticPool,
+    }
+elif app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgres'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'connect_args': {'options': '-c synchronous_commit=off'},
+        'poolclass': StaticPool,
+    }
+
+
+# Each test runs inside a transaction that gets rolled back afterwards.
+# pysqlite doesn't emit BEGIN until the first INSERT/UPDATE/DELETE, which
+# breaks SAVEPOINTs, so take over emitting BEGIN ourselves.
+
+if db.engine.dialect.name == 'sqlite':
+
+    @event.listens_for(db.engine, "connect")
+    def disable_pysqlite_begin(dbapi_connection, connection_record):
+        """Stop pysqlite from managing transactions on its own."""
+
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(db.engine, "begin")
+    def emit_begin(conn):
+        """Emit BEGIN whenever SQLAlchemy starts a transaction."""
+
+        conn.execute("BEGIN")
+
+
+@event.listens_for(db.session, "after_transaction_end")
+def restart_savepoint(session, transaction):
+    """Open a new SAVEPOINT whenever a test commits or rolls back its own.
+
+    This keeps db.session.commit() inside a test from ever committing the
+    outer transaction, so tearDown can always roll everything back.
+    """
+
+    if transaction.nested and not transaction._parent.nested:
+        session.expire_all()
+        session.begin_nested()
+
+
+def setup_test_database():
+    """Create our tables and open the connection every test shares.
+
+    A database that outlives the run (TEST_DATABASE_URL) may still hold rows
+    from last time, so empty every table in a single statement rather than
+    dropping and recreating them all.
+
+    Then open the one connection every test shares, inside a transaction
+    that is never committed, and bind db.session to it.
+
+    This only does anything the first time it's called, so the schema is
+    set up once per process whether the tests run under pytest or unittest.
+    """
+
+    if TransactionalTestCase.connection is not None:
+        return
+
+    db.create_all()
+
+    if db.engine.dialect.name == 'postgresql':
+        tables = ", ".join(table.name for table in db.metadata.sorted_tables)
+        db.session.execute(f"TRUNCATE TABLE {tables} RESTART IDENTITY CASCADE")
+    else:
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+
+    db.session.commit()
+
+    connection = TransactionalTestCase.connection = db.engine.connect()
+    TransactionalTestCase.trans = connection.begin()
+    db.session.remove()
+
+    # Flask-SQLAlchemy's session maps every table to db.engine through
+    # `binds`, which wins over `bind`; clear it so queries use `connection`
+    db.session.configure(bind=connection, binds={})
+
+
+def teardown_test_database():
+    """Throw away everything the tests wrote and close the shared connection."""
+
+    db.session.remove()
+    TransactionalTestCase.trans.rollback()
+    TransactionalTestCase.connection.close()
+    TransactionalTestCase.connection = None
+
+
+class TransactionalTestCase(TestCase):
+    """Test case whose database writes are all rolled back afterwards.
+
+    db.session is bound to the connection shared by the whole run, with
+    Flask-SQLAlchemy's per-table `binds` cleared so that every model query
+    and flush really goes through it (see setup_test_database). Each class
+    works inside a SAVEPOINT on that connection, so setUpClass can add data
+    that every test reads. Each test then runs inside its own SAVEPOINT (see
+    restart_savepoint) which is rolled back in tearDown, leaving the class's
+    data as it was.
+    """
+
+    connection = None
+    trans = None
+
+    @classmethod
+    def setUpClass(cls):
+        """Open a SAVEPOINT for the data shared by this class's tests."""
+
+        super().setUpClass()
+
+        setup_test_database()
+        cls.class_savepoint = cls.connection.begin_nested()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Roll back everything this class wrote."""
+
+        db.session.remove()
+        cls.class_savepoint.rollback()
+
+        super().tearDownClass()
+
+    def setUp(self):
+        """Open a SAVEPOINT for this test's data."""
+
+        self.app_context = app.app_context()
+        self.app_context.push()
+
+        self.savepoint = self.connection.begin_nested()
+        db.session.begin_nested()
+
+    def tearDown(self):
+        """Roll back everything this test wrote."""
+
+        db.session.remove()
+        self.savepoint.rollback()
+        self.app_context.pop()
@@ -20,6 +20,7 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SQLALCHEMY_ECHO'] = False
 app.config['DEBUG_TB_INTERCEPT_REDIRECTS'] = True
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', "it's a secret")
+app.config['BCRYPT_LOG_ROUNDS'] = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
 toolbar = DebugToolbarExtension(app)
 
 connect_db(app)
@@ -144,7 +145,11 @@ def list_users():
     else:
         users = User.query.filter(User.username.like(f"%{search}%")).all()
 
-    return render_template('users/index.html', users=users)
+    # look up who we follow once, rather than once per listed user
+    following_ids = g.user.following_ids() if g.user else set()
+
+    return render_template('users/index.html', users=users,
+                           following_ids=following_ids)
 
 
 @app.route('/users/<int:user_id>')
@@ -173,7 +178,8 @@ def show_following(user_id):
         return redirect("/")
 
     user = User.query.get_or_404(user_id)
-    return render_template('users/following.html', user=user)
+    return render_template('users/following.html', user=user,
+                           following_ids=g.user.following_ids())
 
 
 @app.route('/users/<int:user_id>/followers')
@@ -185,7 +191,8 @@ def users_followers(user_id):
         return redirect("/")
 
     user = User.query.get_or_404(user_id)
-    return render_template('users/followers.html', user=user)
+    return render_template('users/followers.html', user=user,
+                           following_ids=g.user.following_ids())
 
 
 @app.route('/users/follow/<int:follow_id>', methods=['POST'])
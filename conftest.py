@@ -0,0 +1,19 @@
+"""Shared pytest setup for the Warbler tests."""
+
+# run the tests like:
+#
+#    python -m pytest -n auto
+
+
+import pytest
+
+from _test_bootstrap import setup_test_database, teardown_test_database
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    """Set up the test database once for the whole test run."""
+
+    setup_test_database()
+    yield
+    teardown_test_database()
@@ -126,16 +126,43 @@ class User(db.Model):
         return f"<User #{self.id}: {self.username}, {self.email}>"
 
     def is_followed_by(self, other_user):
-        """Is this user followed by `other_user`?"""
+        """Is this user followed by `other_user`?
 
-        found_user_list = [user for user in self.followers if user == other_user]
-        return len(found_user_list) == 1
+        Asks the database for that one row instead of loading every follower.
+        """
+
+        return db.session.query(
+            Follows.query.filter_by(
+                user_being_followed_id=self.id,
+                user_following_id=other_user.id,
+            ).exists()
+        ).scalar()
 
     def is_following(self, other_user):
-        """Is this user following `other_use`?"""
+        """Is this user following `other_user`?
+
+        Asks the database for that one row instead of loading every followed
+        user. Pages listing many users should use `following_ids` instead.
+        """
+
+        return db.session.query(
+            Follows.query.filter_by(
+                user_following_id=self.id,
+                user_being_followed_id=other_user.id,
+            ).exists()
+        ).scalar()
+
+    def following_ids(self):
+        """Return the set of ids of the users this user is following.
+
+        One query, so a page can check every user it lists against it.
+        """
 
-        found_user_list = [user for user in self.following if user == other_user]
-        return len(found_user_list) == 1
+        rows = (db.session
+                .query(Follows.user_being_followed_id)
+                .filter_by(user_following_id=self.id)
+                .all())
+        return {user_id for (user_id,) in rows}
 
     @classmethod
     def signup(cls, username, email, password, image_url):
@@ -215,5 +242,6 @@ def connect_db(app):
 
     db.app = app
     db.init_app(app)
+    bcrypt.init_app(app)
 
     #read models.py done at 5:32pm
@@ -2,50 +2,15 @@
 
 # run these tests like:
 #
-#    python -m unittest test_user_model.py
+#    python -m pytest test_message_model.py
 
 
-import os
-from unittest import TestCase
+from _test_bootstrap import db, User, Message, TransactionalTestCase
 
-from models import db, User, Message, Follows
 
-# BEFORE we import our app, let's set an environmental variable
-# to use a different database for tests (we need to do this
-# before we import our app, since that will have already
-# connected to the database
-
-os.environ['DATABASE_URL'] = "postgresql:///warbler-test"
-
-
-# Now we can import app
-
-from app import app
-
-# Create our tables (we do this here, so we only create the tables
-# once for all tests --- in each test, we'll delete the data
-# and create fresh new clean test data
-
-db.drop_all()
-db.create_all()
-
-class MessageModelTestCase(TestCase):
+class MessageModelTestCase(TransactionalTestCase):
     """Test model for messages."""
 
-    def setUp(self):
-        """Create test client, add sample data."""
-
-        User.query.delete()
-        Message.query.delete()
-        Follows.query.delete()
-
-        self.client = app.test_client()
-
-    def tearDown(self):
-        """Clean up fouled transactions."""
-
-        db.session.rollback()
-
     def test_message_model(self):
         """Does basic model work?"""
 
@@ -56,7 +21,7 @@ class MessageModelTestCase(TestCase):
         )
 
         db.session.add(user)
-        db.session.commit()
+        db.session.flush()
 
         message = Message(text="Test", user_id=user.id)
 
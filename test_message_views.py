@@ -2,47 +2,30 @@
 
 # run these tests like:
 #
-#    FLASK_ENV=production python -m unittest test_message_views.py
+#    FLASK_ENV=production python -m pytest test_message_views.py
 
 
-import os
-from unittest import TestCase
+from _test_bootstrap import (
+    app, db, Message, User, CURR_USER_KEY, TransactionalTestCase)
 
-from models import db, connect_db, Message, User
 
-# BEFORE we import our app, let's set an environmental variable
-# to use a different database for tests (we need to do this
-# before we import our app, since that will have already
-# connected to the database
-
-os.environ['DATABASE_URL'] = "postgresql:///warbler-test"
-
-
-# Now we can import app
-
-from app import app, CURR_USER_KEY
-
-# Create our tables (we do this here, so we only create the tables
-# once for all tests --- in each test, we'll delete the data
-# and create fresh new clean test data
-
-db.create_all()
-
-# Don't have WTForms use CSRF at all, since it's a pain to test
+class MessageViewTestCase(TransactionalTestCase):
+    """Test views for messages."""
 
-app.config['WTF_CSRF_ENABLED'] = False
+    @classmethod
+    def setUpClass(cls):
+        """Create test client."""
 
+        super().setUpClass()
 
-class MessageViewTestCase(TestCase):
-    """Test views for messages."""
+        cls.client = app.test_client()
 
     def setUp(self):
-        """Create test client, add sample data."""
+        """Log out, add sample data."""
 
-        User.query.delete()
-        Message.query.delete()
+        super().setUp()
 
-        self.client = app.test_client()
+        self.client.cookie_jar.clear()
 
         self.testuser = User.signup(username="testuser",
                                     email="test@test.com",
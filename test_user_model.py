@@ -2,53 +2,17 @@
 
 # run these tests like:
 #
-#    python -m unittest test_user_model.py
+#    python -m pytest test_user_model.py
 
 
-import os
-from unittest import TestCase
-
-from models import db, User, Message, Follows
 from sqlalchemy.exc import IntegrityError
 
-# BEFORE we import our app, let's set an environmental variable
-# to use a different database for tests (we need to do this
-# before we import our app, since that will have already
-# connected to the database
-
-os.environ['DATABASE_URL'] = "postgresql:///warbler-test"
-
-
-# Now we can import app
-
-from app import app
-
-# Create our tables (we do this here, so we only create the tables
-# once for all tests --- in each test, we'll delete the data
-# and create fresh new clean test data
-
-db.drop_all()
-db.create_all()
+from _test_bootstrap import db, User, Follows, TransactionalTestCase
 
 
-class UserModelTestCase(TestCase):
+class UserModelTestCase(TransactionalTestCase):
     """Test model for users."""
 
-    def setUp(self):
-        """Create test client, add sample data."""
-
-        db.session.rollback()
-        User.query.delete()
-        Message.query.delete()
-        Follows.query.delete()
-
-        self.client = app.test_client()
-
-    def tearDown(self):
-        """Clean up fouled transactions."""
-
-        db.session.rollback()
-
     def test_user_model(self):
         """Does basic model work?"""
 
@@ -74,14 +38,17 @@ class UserModelTestCase(TestCase):
             password="HASHED_PASSWORD"
         )
         db.session.add(user)
-        db.session.commit()
+        db.session.flush()
 
         self.assertEqual(user.__repr__(), f"<User #{user.id}: testuser, test@test.com>")
 
 
 
     def test_is_following(self):
-        """Does is_following correctly detect when user1 is following user2?"""
+        """
+        Do is_following and following_ids correctly detect when user1 is
+        following user2?
+        """
 
         user1 = User(
             email="test1@test.com",
@@ -96,10 +63,11 @@ class UserModelTestCase(TestCase):
         )
 
         db.session.add_all([user1, user2])
-        db.session.commit()
+        db.session.flush()
 
         # user1.is_following(user2) should return False
         self.assertFalse(user1.is_following(user2))
+        self.assertNotIn(user2.id, user1.following_ids())
 
         follow = Follows(user_being_followed_id=user2.id, user_following_id=user1.id)
         db.session.add(follow)
@@ -107,6 +75,7 @@ class UserModelTestCase(TestCase):
 
         # user1.is_following(user2) should return True
         self.assertTrue(user1.is_following(user2))
+        self.assertEqual(user1.following_ids(), {user2.id})
 
     def test_is_followed_by(self):
         """Does is_followed_by correctly detect when user1 is followed by user2?"""
@@ -124,7 +93,7 @@ class UserModelTestCase(TestCase):
         )
 
         db.session.add_all([user1, user2])
-        db.session.commit()
+        db.session.flush()
 
         # user1.is_followed_by(user2) should return False
         self.assertFalse(user1.is_followed_by(user2))
@@ -147,7 +116,7 @@ class UserModelTestCase(TestCase):
         db.session.add(user1)
         db.session.commit()
         self.assertIsInstance(user1, User)
-        self.assertIn(user1, User.query.all())
+        self.assertIs(User.query.get(user1.id), user1)
 
         # attempting to commit a user with a duplicate username should yield an IntegrityError exception
         user2 = User.signup("testuser", "test2@test.com", "HASHED_PASSWORD2", "")
@@ -180,4 +149,20 @@ class UserModelTestCase(TestCase):
         self.assertFalse(User.authenticate(username="testuse", password="HASHED_PASSWORD"))
 
         # User.authenticate should return False when passed an incorrect password
-        self.assertFalse(User.authenticate(username="testuser", password="HASHEDPASSWORD"))
\ No newline at end of file
+        self.assertFalse(User.authenticate(username="testuser", password="HASHEDPASSWORD"))
+    def test_commit_rolled_back_after_test(self):
+        """Is a row committed in one test gone by the time the next one starts?"""
+
+        user = User(
+            email="test@test.com",
+            username="testuser",
+            password="HASHED_PASSWORD"
+        )
+        db.session.add(user)
+        db.session.commit()
+
+        # finish this test and start the next, as the test runner would
+        self.tearDown()
+        self.setUp()
+
+        self.assertIsNone(User.query.filter_by(username="testuser").first())
@@ -2,48 +2,23 @@
 
 # run these tests like:
 #
-#    python -m unittest test_user_model.py
+#    python -m pytest test_user_views.py
 
 
-import os
-from unittest import TestCase
+from _test_bootstrap import (
+    app, db, User, Message, CURR_USER_KEY, TransactionalTestCase)
 
-from models import db, User, Message, Follows
-from sqlalchemy.exc import IntegrityError
 
-# BEFORE we import our app, let's set an environmental variable
-# to use a different database for tests (we need to do this
-# before we import our app, since that will have already
-# connected to the database
-
-os.environ['DATABASE_URL'] = "postgresql:///warbler-test"
-
-
-# Now we can import app
-
-from app import app, CURR_USER_KEY
-
-# Since we will be testing adding and removing messages, we will need to disable CSRF tokens
-app.config['WTF_CSRF_ENABLED'] = False
-
-# Create our tables (we do this here, so we only create the tables
-# once for all tests --- in each test, we'll delete the data
-# and create fresh new clean test data
-
-db.drop_all()
-db.create_all()
-
-class UserViewsTestCase(TestCase):
+class UserViewsTestCase(TransactionalTestCase):
     """Test views for users."""
 
-    def setUp(self):
-        """Create test client, add sample data."""
+    @classmethod
+    def setUpClass(cls):
+        """Create test client, add sample data shared by every test."""
 
-        User.query.delete()
-        Message.query.delete()
-        Follows.query.delete()
+        super().setUpClass()
 
-        self.client = app.test_client()
+        cls.client = app.test_client()
 
         user = User(
             email="test@test.com",
@@ -51,20 +26,22 @@ class UserViewsTestCase(TestCase):
             password="HASHED_PASSWORD"
         )
         db.session.add(user)
-        db.session.commit()
+        db.session.flush()
 
         message = Message(text="Test", user_id=user.id)
 
         db.session.add(message)
         db.session.commit()
 
-        self.user_id = user.id
-        self.message_id = message.id
-    
-    def tearDown(self):
-        """Clean up fouled transactions."""
+        cls.user_id = user.id
+        cls.message_id = message.id
+
+    def setUp(self):
+        """Start each test logged out."""
+
+        super().setUp()
 
-        db.session.rollback()
+        self.client.cookie_jar.clear()
 
     def test_logged_out_restrictions(self):
         """